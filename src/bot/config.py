@@ -21,9 +21,13 @@ class Config:
     telegram_token: str
     recipient_id: int
     redis: RedisConfig
+    storage_backend: str = 'json'
 
 DATA_FOLDER = os.path.join('src', 'data')
 FEEDBACK_FILE = os.path.join(DATA_FOLDER, 'feedback.json')
+BLOCKED_FILE = os.path.join(DATA_FOLDER, 'blocked.json')
+DATABASE_FILE = os.path.join(DATA_FOLDER, 'bot.db')
+OUTBOX_FILE = os.path.join(DATA_FOLDER, 'outbox.db')
 
 def load_config() -> Config:
     """
@@ -40,6 +44,7 @@ def load_config() -> Config:
     redis_port = os.getenv("REDIS_PORT")
     redis_username = os.getenv("REDIS_USERNAME", "default")
     redis_password = os.getenv("REDIS_PASSWORD")
+    storage_backend = os.getenv("STORAGE_BACKEND", "json")
     
     if not telegram_token:
         raise ValueError("TELEGRAM_TOKEN is missing")
@@ -56,5 +61,6 @@ def load_config() -> Config:
             port=int(redis_port),
             username=redis_username,
             password=redis_password
-        )
+        ),
+        storage_backend=storage_backend
     )
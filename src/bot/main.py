@@ -2,8 +2,11 @@ import telebot
 from src.bot.config import load_config
 from src.services.logger_service import setup_logger
 from src.services.redis_service import RedisService
+from src.services.storage_backend import create_backend
 from src.services.storage_service import StorageService
 from src.services.block_service import BlockService
+from src.services.reputation_service import ReputationService
+from src.services.outbox_service import OutboxService
 from src.handlers.commands import register_command_handlers
 from src.handlers.messages import register_message_handlers
 from src.handlers.callbacks import register_callback_handlers
@@ -15,18 +18,26 @@ def main():
     Initializes configuration, services, and registers handlers before starting the bot.
     """
     config = load_config()
-    storage_service = StorageService()
+    storage_backend = create_backend(config.storage_backend)
+    storage_service = StorageService(storage_backend)
     redis_service = RedisService(config.redis)
-    block_service = BlockService(redis_service)
+    block_service = BlockService(redis_service, storage_backend)
+    reputation_service = ReputationService(redis_service)
+    outbox_service = OutboxService(storage_service)
     
     bot = telebot.TeleBot(config.telegram_token)
     
     register_command_handlers(bot)    
-    register_message_handlers(bot, storage_service, config.recipient_id, redis_service, block_service)
-    register_callback_handlers(bot, block_service)
+    notify_admin = register_message_handlers(bot, storage_service, config.recipient_id, redis_service, block_service, reputation_service, outbox_service)
+    register_callback_handlers(bot, block_service, reputation_service)
+    outbox_service.start(notify_admin)
     
     logger.info('Bot is now running')
-    bot.infinity_polling(timeout=5)
+    try:
+        bot.infinity_polling(timeout=5)
+    finally:
+        outbox_service.stop()
+        logger.info('Outbox sender stopped')
 
 if __name__ == '__main__':
     main()
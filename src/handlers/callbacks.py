@@ -2,13 +2,14 @@ import json
 from telebot import TeleBot, types
 from loguru import logger
 
-def register_callback_handlers(bot: TeleBot, block_service):
+def register_callback_handlers(bot: TeleBot, block_service, reputation_service=None):
     """
     Registers callback query handlers for the bot.
     
     Args:
         bot (TeleBot): The Telegram bot instance.
         block_service (BlockService): Service for managing blocked users.
+        reputation_service (ReputationService, optional): Service for per-user reputation. Defaults to None.
     """
     @bot.callback_query_handler(func=lambda call: True)
     def handle_callback(call):
@@ -27,11 +28,15 @@ def register_callback_handlers(bot: TeleBot, block_service):
                 user_id = data.get('u')
                 if action == 'b':
                     if block_service.block_user(identifier):
+                        if reputation_service:
+                            reputation_service.record(user_id, 'blocked')
                         bot.answer_callback_query(call.id, "User has been blocked.")
                     else:
                         bot.answer_callback_query(call.id, "User is already blocked.")
                 elif action == 'u':
                     if block_service.unblock_user(identifier):
+                        if reputation_service:
+                            reputation_service.clear_block(user_id)
                         bot.answer_callback_query(call.id, "User has been unblocked.")
                     else:
                         bot.answer_callback_query(call.id, "User is not blocked.")
@@ -99,7 +104,8 @@ def register_callback_handlers(bot: TeleBot, block_service):
                         process_bot_answer,
                         user_id=user_id,
                         question=question,
-                        bot=bot
+                        bot=bot,
+                        reputation_service=reputation_service
                     )
         except Exception as e:
             logger.error(f"Error processing callback: {e}")
@@ -128,7 +134,7 @@ def process_group_answer(message, bot, question):
     )
     logger.info(f"Group answer formatted for question: {question[:30]}...")
 
-def process_bot_answer(message, user_id, question, bot):
+def process_bot_answer(message, user_id, question, bot, reputation_service=None):
     """
     Sends the user's reply as an answer directly to the intended recipient.
     
@@ -137,6 +143,7 @@ def process_bot_answer(message, user_id, question, bot):
         user_id (int): The ID of the user to receive the answer.
         question (str): The original question.
         bot (TeleBot): The Telegram bot instance.
+        reputation_service (ReputationService, optional): Service for per-user reputation. Defaults to None.
     """
     try:
         bot.send_message(
@@ -149,6 +156,8 @@ def process_bot_answer(message, user_id, question, bot):
             "Your answer has been sent to the user!",
             parse_mode='HTML'
         )
+        if reputation_service:
+            reputation_service.record(user_id, 'replied')
         logger.info(f"Answer sent to user {user_id}")
     except Exception as e:
         logger.error(f"Failed to send answer to user {user_id}: {e}")
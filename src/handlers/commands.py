@@ -2,6 +2,7 @@ from loguru import logger
 from telebot import TeleBot
 from src.bot.config import load_config
 from src.services.block_service import BlockService
+from src.services.reputation_service import ReputationService
 
 def register_command_handlers(bot: TeleBot):
     """
@@ -45,6 +46,9 @@ def register_command_handlers(bot: TeleBot):
             identifier = identifier[1:]
         block_service = BlockService()
         if block_service.block_user(identifier):
+            # Reputation is keyed by user ID, so it can only be updated for numeric identifiers
+            if identifier.isdigit():
+                ReputationService().record(int(identifier), 'blocked')
             bot.reply_to(message, f"User {identifier} has been blocked.")
         else:
             bot.reply_to(message, f"User {identifier} is already blocked.")
@@ -71,6 +75,8 @@ def register_command_handlers(bot: TeleBot):
             identifier = identifier[1:]
         block_service = BlockService()
         if block_service.unblock_user(identifier):
+            if identifier.isdigit():
+                ReputationService().clear_block(int(identifier))
             bot.reply_to(message, f"User {identifier} has been unblocked.")
         else:
             bot.reply_to(message, f"User {identifier} is not blocked.")
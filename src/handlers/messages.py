@@ -5,7 +5,14 @@ from loguru import logger
 from src.services.redis_service import RedisService
 from src.services.storage_service import StorageService
 
-def register_message_handlers(bot: TeleBot, storage: StorageService, recipient_id: int, redis_service: RedisService = None, block_service=None):
+# Header shown above the feedback in the admin chat, by reputation tier
+TIER_LABELS = {
+    'trusted': '⭐ Trusted sender\n',
+    'normal': '',
+    'suspicious': '⚠️ Suspicious sender\n',
+}
+
+def register_message_handlers(bot: TeleBot, storage: StorageService, recipient_id: int, redis_service: RedisService = None, block_service=None, reputation_service=None, outbox_service=None):
     """
     Registers message handlers for processing incoming feedback messages.
     
@@ -15,48 +22,23 @@ def register_message_handlers(bot: TeleBot, storage: StorageService, recipient_i
         recipient_id (int): The recipient (admin) ID for forwarded messages.
         redis_service (RedisService, optional): Service for rate limiting. Defaults to None.
         block_service (BlockService, optional): Service for checking blocked users. Defaults to None.
+        reputation_service (ReputationService, optional): Service for per-user reputation. Defaults to None.
+        outbox_service (OutboxService, optional): Durable outbox for admin notifications. Defaults to None,
+            in which case feedback is stored and forwarded synchronously.
+    
+    Returns:
+        Callable[[dict], None]: The function forwarding a feedback entry to the admin,
+            to be passed to the outbox sender.
     """
-    @bot.message_handler(func=lambda message: True)
-    def handle_message(message):
+    def notify_admin(entry):
         """
-        Processes an incoming message by checking if the user is blocked,
-        applying rate limits, validating content, and then forwarding the message
-        to the admin with inline buttons (including a Block/Unblock button).
+        Forwards a feedback entry to the admin with inline buttons (including a Block/Unblock button).
         
         Args:
-            message: The incoming message from the user.
+            entry (dict): The feedback entry with user_id, user_identifier, text and tier.
         """
-        user_id = message.from_user.id
-        # Compute user_identifier using username if available; otherwise use user_id as string.
-        user_identifier = message.from_user.username if message.from_user.username else str(user_id)
-
-        # Check if user is blocked
-        if block_service and block_service.is_blocked(user_identifier):
-            logger.info(f"Blocked user {user_identifier} attempted to send a message.")
-            return  # Ignore messages from blocked users
-        
-        # Rate limiting checks via Redis (if available)
-        if redis_service:
-            if is_limited_fast := redis_service.check_rate_limit(user_id, 'fast')[0]:
-                logger.warning(f"User {user_id} exceeded fast rate limit")
-                bot.reply_to(message, "Please slow down. Try sending messages less frequently.")
-                return
-            if (is_limited_slow := redis_service.check_rate_limit(user_id, 'slow'))[0]:
-                wait_time = redis_service.check_rate_limit(user_id, 'slow')[1]
-                logger.warning(f"User {user_id} exceeded slow rate limit (3 messages/minute)")
-                bot.reply_to(message, f"You have sent too many messages. Please wait {wait_time} seconds before trying again.")
-                return
-
-        # Basic validation of message content
-        if not any(c.isalnum() for c in message.text):
-            logger.warning(f"User {user_identifier} tried to send emoji-only message")
-            bot.reply_to(message, "Please include some text in your message, not just emojis.")
-            return
-
-        if len(message.text) > 500:
-            logger.warning(f"User {user_identifier} tried to send message exceeding 500 chars")
-            bot.reply_to(message, "Sorry, your message is too long. Please divide it into several parts and try again.")
-            return
+        user_id = entry['user_id']
+        user_identifier = entry['user_identifier']
 
         # Build the inline keyboard for the admin message
         markup = types.InlineKeyboardMarkup(row_width=4)
@@ -90,21 +72,98 @@ def register_message_handlers(bot: TeleBot, storage: StorageService, recipient_i
 
         bot.send_message(
             chat_id=recipient_id,
-            text=f'❗New feedback: "{message.text}"',
+            text=f'{TIER_LABELS.get(entry["tier"], "")}❗New feedback: "{entry["text"]}"',
             reply_markup=markup
         )
 
+    def reject(user_id: int):
+        if reputation_service:
+            reputation_service.record(user_id, 'rejected')
+
+    def is_rate_limited(message, user_id: int, tier: str) -> bool:
+        """
+        Applies the tier's rate limits and replies to the user if one is exceeded.
+        
+        Args:
+            message: The incoming message from the user.
+            user_id (int): The user's Telegram ID.
+            tier (str): The user's reputation tier.
+            
+        Returns:
+            bool: True if the message should be dropped.
+        """
+        if not redis_service:
+            return False
+        if redis_service.check_rate_limit(user_id, 'fast', tier)[0]:
+            logger.warning(f"User {user_id} ({tier}) exceeded fast rate limit")
+            bot.reply_to(message, "Please slow down. Try sending messages less frequently.")
+            return True
+        is_limited_slow, wait_time = redis_service.check_rate_limit(user_id, 'slow', tier)
+        if is_limited_slow:
+            logger.warning(f"User {user_id} ({tier}) exceeded slow rate limit")
+            bot.reply_to(message, f"You have sent too many messages. Please wait {wait_time} seconds before trying again.")
+            return True
+        return False
+
+    @bot.message_handler(func=lambda message: True)
+    def handle_message(message):
+        """
+        Processes an incoming message by checking if the user is blocked,
+        applying the rate limits of the user's reputation tier, validating
+        content, and then queueing the message for the admin.
+        
+        Args:
+            message: The incoming message from the user.
+        """
+        user_id = message.from_user.id
+        # Compute user_identifier using username if available; otherwise use user_id as string.
+        user_identifier = message.from_user.username if message.from_user.username else str(user_id)
+
+        # Check if user is blocked
+        if block_service and block_service.is_blocked(user_identifier):
+            logger.info(f"Blocked user {user_identifier} attempted to send a message.")
+            return  # Ignore messages from blocked users
+
+        # Rate limiting checks via Redis (if available), using the limits of the user's tier
+        tier = reputation_service.get_tier(user_id) if reputation_service else 'normal'
+        if is_rate_limited(message, user_id, tier):
+            return
+
+        # Basic validation of message content
+        if not any(c.isalnum() for c in message.text):
+            logger.warning(f"User {user_identifier} tried to send emoji-only message")
+            bot.reply_to(message, "Please include some text in your message, not just emojis.")
+            reject(user_id)
+            return
+
+        if len(message.text) > 500:
+            logger.warning(f"User {user_identifier} tried to send message exceeding 500 chars")
+            bot.reply_to(message, "Sorry, your message is too long. Please divide it into several parts and try again.")
+            reject(user_id)
+            return
+
         try:
             message.text.encode(encoding="utf-8")
         except UnicodeEncodeError:
             logger.error(f"Message from user {user_identifier} not saved due to encoding issues")
             bot.reply_to(message, "An error occurred. Please try removing special characters and emojis.")
+            reject(user_id)
             return
 
         date_str = str(dt.datetime.now().date())
         time_str = str(dt.datetime.now().time())[:-10]
-        storage.add_message(message.text, date_str, time_str)
-        logger.debug(f"Message from user {user_identifier} added to storage")
+        if outbox_service:
+            # Storage and the admin notification are handled by the outbox sender
+            priority = reputation_service.get_priority(tier) if reputation_service else 1
+            outbox_service.enqueue(user_id, user_identifier, message.text, date_str, time_str, tier, priority)
+        else:
+            storage.add_message(message.text, date_str, time_str, user_id)
+            logger.debug(f"Message from user {user_identifier} added to storage")
+            notify_admin({'user_id': user_id, 'user_identifier': user_identifier, 'text': message.text, 'tier': tier})
+        if reputation_service:
+            reputation_service.record(user_id, 'accepted')
 
         bot.reply_to(message, f'Thank you! Your message: "{message.text}"\nHas been successfully recorded. You\'ll receive a response soon.✨')
         logger.info(f"New feedback received from user {user_identifier}: \"{message.text}\"")
+
+    return notify_admin
@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+from src.bot.config import DATA_FOLDER, OUTBOX_FILE
+from src.services.storage_backend import ConnectionPool, ensure_column
+from src.services.storage_service import StorageService
+
+BATCH_SIZE = 20
+POLL_INTERVAL = 5
+MAX_BACKOFF = 300
+# Delivered entries are kept this long before being pruned
+DELIVERED_RETENTION = 7 * 24 * 60 * 60
+PRUNE_INTERVAL = 60 * 60
+
+class OutboxService:
+    """
+    Durable outbox for accepted feedback.
+    Entries are written once to a SQLite database in WAL mode and drained by a
+    background sender that saves them to storage, notifies the admin and marks
+    them delivered. Transient failures are retried indefinitely with capped
+    exponential backoff; only permanent API errors mark an entry as failed.
+    """
+    def __init__(self, storage: StorageService):
+        """
+        Opens the outbox database and creates its schema if needed.
+
+        Args:
+            storage (StorageService): Service for storing feedback messages.
+        """
+        os.makedirs(DATA_FOLDER, exist_ok=True)
+        self.storage = storage
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_prune = 0
+        self.pool = ConnectionPool(OUTBOX_FILE)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with self.pool.connection() as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    user_identifier TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    time TEXT NOT NULL,
+                    tier TEXT NOT NULL DEFAULT 'normal',
+                    priority INTEGER NOT NULL DEFAULT 1,
+                    stored INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    delivered_at REAL
+                )
+            """)
+            ensure_column(conn, 'outbox', 'delivered_at', 'REAL')
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, priority DESC, id)"
+            )
+            # A random key for this outbox database; together with the entry ID it forms the
+            # idempotency key passed to storage, so IDs from a recreated outbox never collide
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('instance', ?)", (uuid.uuid4().hex,)
+            )
+            self._instance = conn.execute(
+                "SELECT value FROM meta WHERE key = 'instance'"
+            ).fetchone()[0]
+
+    def enqueue(self, user_id: int, user_identifier: str, text: str, date: str, time_str: str,
+                tier: str = 'normal', priority: int = 1) -> int:
+        """
+        Durably records accepted feedback and wakes up the sender.
+
+        Args:
+            user_id (int): The sender's Telegram ID.
+            user_identifier (str): The sender's username or ID as string.
+            text (str): The text of the feedback message.
+            date (str): The date the message was received.
+            time_str (str): The time the message was received.
+            tier (str): The sender's reputation tier. Defaults to 'normal'.
+            priority (int): Queue priority; higher values are sent first. Defaults to 1.
+
+        Returns:
+            int: The ID of the outbox entry.
+        """
+        with self.pool.connection() as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO outbox (user_id, user_identifier, text, date, time, tier, priority) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user_id, user_identifier, text, date, time_str, tier, priority)
+            )
+        self._wake.set()
+        logger.debug(f"Outbox entry {cursor.lastrowid} queued for user {user_identifier}")
+        return cursor.lastrowid
+
+    def _fetch_due(self, limit: int) -> List[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM outbox WHERE status = 'pending' AND next_attempt_at <= ? "
+                "ORDER BY priority DESC, id LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _mark_stored(self, entry_ids: List[int]) -> None:
+        with self.pool.connection() as conn, conn:
+            conn.executemany(
+                "UPDATE outbox SET stored = 1 WHERE id = ?",
+                [(entry_id,) for entry_id in entry_ids]
+            )
+
+    def _mark_delivered(self, entry_id: int) -> None:
+        with self.pool.connection() as conn, conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'delivered', delivered_at = ? WHERE id = ?",
+                (time.time(), entry_id)
+            )
+
+    @staticmethod
+    def _classify_error(error: Exception) -> Tuple[bool, Optional[int]]:
+        """
+        Tells permanent Telegram API errors apart from transient ones.
+
+        Args:
+            error (Exception): The error raised while sending.
+
+        Returns:
+            Tuple[bool, Optional[int]]: Whether the error is permanent, and the
+                                        retry_after delay requested by Telegram, if any.
+        """
+        error_code = getattr(error, 'error_code', None)
+        result = getattr(error, 'result_json', None)
+        retry_after = None
+        if isinstance(result, dict):
+            retry_after = result.get('parameters', {}).get('retry_after')
+        # 4xx responses other than 429 (Too Many Requests) will fail the same way on every retry
+        permanent = isinstance(error_code, int) and 400 <= error_code < 500 and error_code != 429
+        return permanent, retry_after
+
+    def _mark_attempt_failed(self, entry: Dict[str, Any], error: Exception) -> None:
+        attempts = entry['attempts'] + 1
+        permanent, retry_after = self._classify_error(error)
+        if permanent:
+            status = 'failed'
+            next_attempt_at = 0
+            logger.error(
+                f"Outbox entry {entry['id']} permanently failed and will not be retried "
+                f"(user {entry['user_identifier']}): \"{entry['text']}\" - {error}"
+            )
+        else:
+            status = 'pending'
+            delay = retry_after if retry_after else min(2 ** min(attempts, 16), MAX_BACKOFF)
+            next_attempt_at = time.time() + delay
+            logger.warning(f"Failed to deliver outbox entry {entry['id']}, retrying in {delay}s: {error}")
+        with self.pool.connection() as conn, conn:
+            conn.execute(
+                "UPDATE outbox SET attempts = ?, status = ?, next_attempt_at = ? WHERE id = ?",
+                (attempts, status, next_attempt_at, entry['id'])
+            )
+
+    def prune_delivered(self) -> int:
+        """
+        Deletes delivered entries older than DELIVERED_RETENTION.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        with self.pool.connection() as conn, conn:
+            cursor = conn.execute(
+                "DELETE FROM outbox WHERE status = 'delivered' AND delivered_at < ?",
+                (time.time() - DELIVERED_RETENTION,)
+            )
+        if cursor.rowcount:
+            logger.debug(f"Pruned {cursor.rowcount} delivered outbox entries")
+        return cursor.rowcount
+
+    def count_failed(self) -> int:
+        """
+        Returns the number of entries that permanently failed to be delivered.
+
+        Returns:
+            int: The number of failed entries.
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'failed'").fetchone()[0]
+
+    def drain(self, notify: Callable[[Dict[str, Any]], None]) -> int:
+        """
+        Processes one batch of due entries.
+        Entries not yet saved are written to storage in a single batch, keyed by
+        outbox entry so a crash before they are marked stored cannot duplicate them.
+        Each entry is then passed to notify and marked delivered as soon as it
+        succeeds, so a crash re-sends at most the entry in flight. The batch stops
+        at the first failed notification so an API outage is not hammered.
+
+        Args:
+            notify (Callable[[Dict[str, Any]], None]): Sends the admin notification for an entry.
+
+        Returns:
+            int: The number of entries delivered in this batch.
+        """
+        batch = self._fetch_due(BATCH_SIZE)
+        unstored = [entry for entry in batch if not entry['stored']]
+        if unstored:
+            self.storage.add_messages(
+                [{**entry, 'outbox_key': f"{self._instance}:{entry['id']}"} for entry in unstored]
+            )
+            self._mark_stored([entry['id'] for entry in unstored])
+
+        delivered = 0
+        for entry in batch:
+            try:
+                notify(entry)
+            except Exception as e:
+                self._mark_attempt_failed(entry, e)
+                break
+            self._mark_delivered(entry['id'])
+            delivered += 1
+        return delivered
+
+    def start(self, notify: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Starts the background sender thread.
+
+        Args:
+            notify (Callable[[Dict[str, Any]], None]): Sends the admin notification for an entry.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        failed = self.count_failed()
+        if failed:
+            logger.error(f"{failed} outbox entries permanently failed to be delivered; see {OUTBOX_FILE}")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(notify,), name='outbox-sender', daemon=True)
+        self._thread.start()
+        logger.info("Outbox sender started")
+
+    def stop(self) -> None:
+        """
+        Stops the background sender thread after its current batch.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, notify: Callable[[Dict[str, Any]], None]) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                if time.time() - self._last_prune >= PRUNE_INTERVAL:
+                    self.prune_delivered()
+                    self._last_prune = time.time()
+                delivered = self.drain(notify)
+            except Exception as e:
+                logger.error(f"Outbox sender error: {e}")
+                delivered = 0
+            # Keep draining while full batches go through; otherwise wait for new entries or a retry
+            if delivered < BATCH_SIZE:
+                self._wake.wait(POLL_INTERVAL)
@@ -3,6 +3,13 @@ import redis
 from loguru import logger
 from src.bot.config import RedisConfig
 
+# (window in seconds, max requests) per reputation tier and limit type
+RATE_LIMITS = {
+    'trusted': {'fast': (2, 3), 'slow': (60, 6)},
+    'normal': {'fast': (2, 2), 'slow': (60, 3)},
+    'suspicious': {'fast': (5, 1), 'slow': (120, 2)},
+}
+
 class RedisService:
     """
     Service for managing Redis connection and rate limiting.
@@ -45,13 +52,14 @@ class RedisService:
             logger.error(f"Failed to connect to Redis: {e}")
             self.client = None
     
-    def check_rate_limit(self, user_id: int, limit_type: str) -> Tuple[bool, int]:
+    def check_rate_limit(self, user_id: int, limit_type: str, tier: str = 'normal') -> Tuple[bool, int]:
         """
         Checks whether a user has exceeded the allowed rate limit.
 
         Args:
             user_id (int): The user's Telegram ID.
             limit_type (str): The type of rate limit to check ('fast' or 'slow').
+            tier (str): The user's reputation tier. Defaults to 'normal'.
 
         Returns:
             Tuple[bool, int]: A tuple where the first element indicates if the rate limit is exceeded,
@@ -61,10 +69,10 @@ class RedisService:
             return False, 0
             
         try:
-            if limit_type == 'fast':
-                key, window, max_requests = f"rate:fast:{user_id}", 2, 2
-            else:
-                key, window, max_requests = f"rate:slow:{user_id}", 60, 3
+            limits = RATE_LIMITS.get(tier, RATE_LIMITS['normal'])
+            limit_type = 'fast' if limit_type == 'fast' else 'slow'
+            key = f"rate:{limit_type}:{user_id}"
+            window, max_requests = limits[limit_type]
                 
             current = self.client.get(key)
             
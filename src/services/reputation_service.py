@@ -0,0 +1,182 @@
+import time
+from typing import Dict
+import redis
+from loguru import logger
+
+# Weight applied to each recorded event when updating a user's score
+EVENT_WEIGHTS = {
+    'accepted': 1,
+    'rejected': -2,
+    'blocked': -10,
+    'replied': 3,
+}
+
+TRUSTED_SCORE = 10
+SUSPICIOUS_SCORE = -5
+
+# Volume alone never earns trust: the admin must have replied and the profile must be old enough
+TRUSTED_MIN_REPLIES = 1
+TRUSTED_MIN_AGE = 14 * 24 * 60 * 60
+
+# The score halves towards zero every week, so old behaviour stops counting
+SCORE_HALF_LIFE = 7 * 24 * 60 * 60
+
+# Higher value means the admin should see the feedback earlier
+TIER_PRIORITY = {
+    'trusted': 2,
+    'normal': 1,
+    'suspicious': 0,
+}
+
+# Decays the stored score to now, applies the weight and optionally bumps or resets a counter.
+# KEYS[1]: profile key. ARGV: now, half-life, weight, counter field ('' for none), counter mode ('incr' or 'reset').
+# In 'reset' mode the weight only lifts the score back up to zero, never above it.
+# The first update also stamps created_at, which the trusted tier uses as the profile age.
+UPDATE_SCRIPT = """
+local score = tonumber(redis.call('HGET', KEYS[1], 'score') or '0')
+local updated_at = tonumber(redis.call('HGET', KEYS[1], 'updated_at') or ARGV[1])
+local now = tonumber(ARGV[1])
+score = score * math.pow(0.5, (now - updated_at) / tonumber(ARGV[2]))
+local weighted = score + tonumber(ARGV[3])
+if ARGV[5] == 'reset' then
+    weighted = math.min(weighted, math.max(score, 0))
+end
+redis.call('HSET', KEYS[1], 'score', tostring(weighted), 'updated_at', ARGV[1])
+redis.call('HSETNX', KEYS[1], 'created_at', ARGV[1])
+if ARGV[4] ~= '' then
+    if ARGV[5] == 'reset' then
+        redis.call('HSET', KEYS[1], ARGV[4], 0)
+    else
+        redis.call('HINCRBY', KEYS[1], ARGV[4], 1)
+    end
+end
+"""
+
+class ReputationService:
+    """
+    Service for tracking per-user reputation profiles.
+    Implements a singleton pattern.
+    Each profile is a Redis hash holding event counters and a score that decays
+    over time, updated incrementally so the tier can be read back with a single lookup.
+    """
+    _instance = None
+
+    def __new__(cls, redis_service=None):
+        if cls._instance is None:
+            cls._instance = super(ReputationService, cls).__new__(cls)
+            cls._instance.redis_service = redis_service
+            cls._instance._update = None
+        return cls._instance
+
+    @property
+    def _client(self):
+        if self.redis_service and self.redis_service.client:
+            return self.redis_service.client
+        return None
+
+    def _run_update(self, user_id: int, weight: int, field: str, mode: str) -> None:
+        if self._update is None:
+            self._update = self._client.register_script(UPDATE_SCRIPT)
+        self._update(
+            keys=[f"reputation:{user_id}"],
+            args=[time.time(), SCORE_HALF_LIFE, weight, field, mode]
+        )
+
+    def record(self, user_id: int, event: str) -> None:
+        """
+        Records an event in the user's profile and updates their score.
+
+        Args:
+            user_id (int): The user's Telegram ID.
+            event (str): One of 'accepted', 'rejected', 'blocked' or 'replied'.
+        """
+        if event not in EVENT_WEIGHTS:
+            logger.error(f"Unknown reputation event: {event}")
+            return
+        if not self._client:
+            return
+
+        try:
+            self._run_update(user_id, EVENT_WEIGHTS[event], event, 'incr')
+            logger.debug(f"Recorded '{event}' for user {user_id}")
+        except redis.RedisError as e:
+            logger.error(f"Redis error recording reputation: {e}")
+
+    def clear_block(self, user_id: int) -> None:
+        """
+        Clears the block history after an unblock and offsets its penalty.
+        The score is lifted by the block weight but never above zero or its current value.
+
+        Args:
+            user_id (int): The user's Telegram ID.
+        """
+        if not self._client:
+            return
+
+        try:
+            self._run_update(user_id, -EVENT_WEIGHTS['blocked'], 'blocked', 'reset')
+            logger.debug(f"Cleared block history for user {user_id}")
+        except redis.RedisError as e:
+            logger.error(f"Redis error clearing reputation: {e}")
+
+    def get_profile(self, user_id: int) -> Dict[str, float]:
+        """
+        Returns the user's reputation profile.
+
+        Args:
+            user_id (int): The user's Telegram ID.
+
+        Returns:
+            Dict[str, float]: Event counters, the score decayed to the current time and
+                              the profile age in seconds; missing fields default to 0.
+        """
+        profile = {field: 0 for field in (*EVENT_WEIGHTS, 'score', 'age')}
+        if not self._client:
+            return profile
+
+        try:
+            stored = self._client.hgetall(f"reputation:{user_id}")
+        except redis.RedisError as e:
+            logger.error(f"Redis error reading reputation: {e}")
+            return profile
+
+        for field in EVENT_WEIGHTS:
+            profile[field] = int(stored.get(field, 0))
+        if 'score' in stored:
+            elapsed = time.time() - float(stored.get('updated_at', time.time()))
+            profile['score'] = float(stored['score']) * 0.5 ** (max(elapsed, 0) / SCORE_HALF_LIFE)
+        if 'created_at' in stored:
+            profile['age'] = max(time.time() - float(stored['created_at']), 0)
+        return profile
+
+    def get_tier(self, user_id: int) -> str:
+        """
+        Determines the user's tier from their reputation profile.
+        Trusted requires a high score, admin replies and a profile older than TRUSTED_MIN_AGE.
+
+        Args:
+            user_id (int): The user's Telegram ID.
+
+        Returns:
+            str: 'trusted', 'normal' or 'suspicious'.
+        """
+        profile = self.get_profile(user_id)
+        if profile['blocked'] > 0 or profile['score'] <= SUSPICIOUS_SCORE:
+            return 'suspicious'
+        if (profile['score'] >= TRUSTED_SCORE
+                and profile['replied'] >= TRUSTED_MIN_REPLIES
+                and profile['age'] >= TRUSTED_MIN_AGE):
+            return 'trusted'
+        return 'normal'
+
+    def get_priority(self, tier: str) -> int:
+        """
+        Returns the admin queue priority for the given tier.
+
+        Args:
+            tier (str): The user's tier.
+
+        Returns:
+            int: The priority; higher values are handled first.
+        """
+        return TIER_PRIORITY.get(tier, TIER_PRIORITY['normal'])
@@ -0,0 +1,417 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from loguru import logger
+from src.bot.config import DATA_FOLDER, FEEDBACK_FILE, BLOCKED_FILE, DATABASE_FILE
+
+POOL_SIZE = 4
+STATEMENT_CACHE_SIZE = 64
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Opens a SQLite connection in WAL mode that can be shared between threads.
+
+    Args:
+        path (str): Path to the database file.
+
+    Returns:
+        sqlite3.Connection: The configured connection.
+    """
+    conn = sqlite3.connect(
+        path,
+        check_same_thread=False,
+        timeout=10,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def ensure_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> None:
+    """
+    Adds a column to an existing table if it is missing.
+
+    Args:
+        conn (sqlite3.Connection): The connection to use.
+        table (str): The table name.
+        column (str): The column name.
+        definition (str): The column type and constraints.
+    """
+    columns = [row['name'] for row in conn.execute(f"PRAGMA table_info({table})")]
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+class StorageBackend(ABC):
+    """
+    Interface for persisting feedback messages and blocked users.
+    """
+    @abstractmethod
+    def add_messages(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Stores a batch of feedback messages in a single write.
+        Messages carrying an 'outbox_key' that was already stored are skipped,
+        so a batch can be safely written again after a crash.
+
+        Args:
+            messages (List[Dict[str, Any]]): Messages with 'text', 'date', 'time' and
+                optional 'user_id' and 'outbox_key'.
+
+        Raises:
+            Exception: If the batch could not be persisted; nothing from it is kept.
+        """
+
+    @abstractmethod
+    def count_messages(self) -> int:
+        """
+        Returns the total number of stored messages.
+        """
+
+    @abstractmethod
+    def get_messages_by_date(self, date: str) -> List[Dict[str, Any]]:
+        """
+        Returns all messages received on the given date.
+
+        Args:
+            date (str): The date in YYYY-MM-DD format.
+        """
+
+    @abstractmethod
+    def get_messages_by_user(self, user_id: int) -> List[Dict[str, Any]]:
+        """
+        Returns all messages sent by the given user.
+
+        Args:
+            user_id (int): The user's Telegram ID.
+        """
+
+    @abstractmethod
+    def is_blocked(self, user_identifier: str) -> bool:
+        """
+        Checks if the identifier is in the blocked list.
+
+        Args:
+            user_identifier (str): The user's username (without '@') or their ID as string.
+        """
+
+    @abstractmethod
+    def add_blocked(self, user_identifier: str) -> bool:
+        """
+        Adds the identifier to the blocked list.
+
+        Args:
+            user_identifier (str): The user's username (without '@') or their ID as string.
+
+        Returns:
+            bool: True if it was added; False if it was already present.
+        """
+
+    @abstractmethod
+    def remove_blocked(self, user_identifier: str) -> bool:
+        """
+        Removes the identifier from the blocked list.
+
+        Args:
+            user_identifier (str): The user's username (without '@') or their ID as string.
+
+        Returns:
+            bool: True if it was removed; False if it was not present.
+        """
+
+class JsonBackend(StorageBackend):
+    """
+    Backend keeping data in memory and persisting it to the JSON files under DATA_FOLDER.
+    The file formats are the same ones used before backends were introduced.
+    """
+    def __init__(self):
+        os.makedirs(DATA_FOLDER, exist_ok=True)
+        self._lock = threading.Lock()
+        self.data = self._read_feedback()
+        self.blocked = self._read_blocked()
+        self._outbox_keys = {
+            value['outbox_key'] for key, value in self.data.items()
+            if key != 'number_of_messages' and 'outbox_key' in value
+        }
+
+    def _read_feedback(self) -> Dict[str, Any]:
+        if not os.path.exists(FEEDBACK_FILE):
+            self._write_json(FEEDBACK_FILE, {"number_of_messages": 0})
+
+        with open(FEEDBACK_FILE, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+                logger.debug('Content loaded from json')
+            except json.JSONDecodeError:
+                logger.warning('Feedback file is empty, initializing...')
+                data = {"number_of_messages": 0}
+                self._write_json(FEEDBACK_FILE, data)
+        return data
+
+    def _read_blocked(self) -> List[str]:
+        if not os.path.exists(BLOCKED_FILE):
+            self._write_blocked([])
+            return []
+        try:
+            with open(BLOCKED_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            # Leave the file untouched so a corrupted list can be recovered by hand
+            logger.error(f"Error reading blocked file: {e}")
+            return []
+
+    def _write_json(self, path: str, data: Any) -> None:
+        # Write to a temporary file first so a failed write never truncates the existing file
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        logger.debug(f'Content written to {path}')
+
+    def _write_blocked(self, data: List[str]) -> None:
+        try:
+            self._write_json(BLOCKED_FILE, data)
+        except Exception as e:
+            logger.error(f"Error writing blocked file: {e}")
+
+    def add_messages(self, messages: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            previous_count = self.data['number_of_messages']
+            new_keys = set()
+            for message in messages:
+                outbox_key = message.get('outbox_key')
+                if outbox_key is not None and (outbox_key in self._outbox_keys or outbox_key in new_keys):
+                    logger.debug(f"Skipping already stored outbox entry {outbox_key}")
+                    continue
+                self.data['number_of_messages'] += 1
+                entry = {
+                    'date': message['date'],
+                    'time': message['time'],
+                    'text': message['text']
+                }
+                if message.get('user_id') is not None:
+                    entry['user_id'] = message['user_id']
+                if outbox_key is not None:
+                    entry['outbox_key'] = outbox_key
+                    new_keys.add(outbox_key)
+                self.data[str(self.data['number_of_messages'])] = entry
+            if self.data['number_of_messages'] == previous_count:
+                return
+            try:
+                self._write_json(FEEDBACK_FILE, self.data)
+            except Exception:
+                # Undo the in-memory changes so memory matches what is on disk
+                for number in range(previous_count + 1, self.data['number_of_messages'] + 1):
+                    self.data.pop(str(number), None)
+                self.data['number_of_messages'] = previous_count
+                raise
+            self._outbox_keys |= new_keys
+
+    def count_messages(self) -> int:
+        with self._lock:
+            return self.data['number_of_messages']
+
+    def _messages(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [value for key, value in self.data.items() if key != 'number_of_messages']
+
+    def get_messages_by_date(self, date: str) -> List[Dict[str, Any]]:
+        return [message for message in self._messages() if message['date'] == date]
+
+    def get_messages_by_user(self, user_id: int) -> List[Dict[str, Any]]:
+        return [message for message in self._messages() if message.get('user_id') == user_id]
+
+    def is_blocked(self, user_identifier: str) -> bool:
+        with self._lock:
+            return user_identifier in self.blocked
+
+    def add_blocked(self, user_identifier: str) -> bool:
+        with self._lock:
+            if user_identifier in self.blocked:
+                return False
+            self.blocked.append(user_identifier)
+            self._write_blocked(self.blocked)
+            return True
+
+    def remove_blocked(self, user_identifier: str) -> bool:
+        with self._lock:
+            if user_identifier not in self.blocked:
+                return False
+            self.blocked.remove(user_identifier)
+            self._write_blocked(self.blocked)
+            return True
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections.
+    Connections are opened lazily up to the pool size; further callers wait for one to be released.
+    """
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self._idle = queue.Queue(maxsize=size)
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrows a connection for the duration of the block.
+
+        Yields:
+            sqlite3.Connection: A connection in WAL mode.
+        """
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = connect(self.path)
+            try:
+                yield conn
+            finally:
+                self._idle.put_nowait(conn)
+        finally:
+            self._slots.release()
+
+class SqliteBackend(StorageBackend):
+    """
+    Backend storing data in an embedded SQLite database in WAL mode.
+    Feedback is indexed by date and user; batches are written in a single transaction.
+    """
+    def __init__(self, path: str = DATABASE_FILE, pool_size: int = POOL_SIZE):
+        os.makedirs(DATA_FOLDER, exist_ok=True)
+        self.pool = ConnectionPool(path, pool_size)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with self.pool.connection() as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS feedback (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    date TEXT NOT NULL,
+                    time TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    outbox_key TEXT
+                )
+            """)
+            ensure_column(conn, 'feedback', 'outbox_key', 'TEXT')
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_outbox_key ON feedback (outbox_key)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_date ON feedback (date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user ON feedback (user_id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS blocked (identifier TEXT PRIMARY KEY)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone() is None:
+                self._import_json(conn)
+                conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', '1')")
+
+    def _import_json(self, conn: sqlite3.Connection) -> None:
+        """
+        Imports feedback.json and blocked.json into a freshly created database,
+        so switching backends does not lose feedback or unblock anyone.
+
+        Args:
+            conn (sqlite3.Connection): The connection of the open schema transaction.
+
+        Raises:
+            RuntimeError: If a JSON file exists but cannot be read.
+        """
+        has_rows = (conn.execute("SELECT 1 FROM feedback LIMIT 1").fetchone()
+                    or conn.execute("SELECT 1 FROM blocked LIMIT 1").fetchone())
+        json_files = [path for path in (FEEDBACK_FILE, BLOCKED_FILE) if os.path.exists(path)]
+        if has_rows:
+            if json_files:
+                logger.warning(f"Database already has data; not importing {', '.join(json_files)}")
+            return
+
+        data = {}
+        for path in json_files:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data[path] = json.load(f)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Cannot import {path} into the SQLite database: {e}. "
+                    f"Fix or remove the file, or keep STORAGE_BACKEND=json."
+                ) from e
+
+        feedback = data.get(FEEDBACK_FILE, {})
+        numbers = sorted(int(key) for key in feedback if key != 'number_of_messages')
+        conn.executemany(
+            "INSERT OR IGNORE INTO feedback (user_id, date, time, text, outbox_key) VALUES (?, ?, ?, ?, ?)",
+            [(feedback[str(n)].get('user_id'), feedback[str(n)]['date'], feedback[str(n)]['time'],
+              feedback[str(n)]['text'], feedback[str(n)].get('outbox_key')) for n in numbers]
+        )
+        blocked = data.get(BLOCKED_FILE, [])
+        conn.executemany(
+            "INSERT OR IGNORE INTO blocked (identifier) VALUES (?)",
+            [(identifier,) for identifier in blocked]
+        )
+        if json_files:
+            logger.info(f"Imported {len(numbers)} feedback messages and {len(blocked)} blocked users from JSON")
+
+    def add_messages(self, messages: List[Dict[str, Any]]) -> None:
+        with self.pool.connection() as conn, conn:
+            # The unique outbox_key index turns re-sent batches into no-ops
+            conn.executemany(
+                "INSERT OR IGNORE INTO feedback (user_id, date, time, text, outbox_key) VALUES (?, ?, ?, ?, ?)",
+                [(m.get('user_id'), m['date'], m['time'], m['text'], m.get('outbox_key')) for m in messages]
+            )
+
+    def count_messages(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+
+    def _select_messages(self, where: str, value: Any) -> List[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT user_id, date, time, text FROM feedback WHERE {where} = ? ORDER BY id",
+                (value,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_messages_by_date(self, date: str) -> List[Dict[str, Any]]:
+        return self._select_messages('date', date)
+
+    def get_messages_by_user(self, user_id: int) -> List[Dict[str, Any]]:
+        return self._select_messages('user_id', user_id)
+
+    def is_blocked(self, user_identifier: str) -> bool:
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT 1 FROM blocked WHERE identifier = ?", (user_identifier,)).fetchone()
+        return row is not None
+
+    def add_blocked(self, user_identifier: str) -> bool:
+        with self.pool.connection() as conn, conn:
+            cursor = conn.execute("INSERT OR IGNORE INTO blocked (identifier) VALUES (?)", (user_identifier,))
+            return cursor.rowcount > 0
+
+    def remove_blocked(self, user_identifier: str) -> bool:
+        with self.pool.connection() as conn, conn:
+            cursor = conn.execute("DELETE FROM blocked WHERE identifier = ?", (user_identifier,))
+            return cursor.rowcount > 0
+
+def create_backend(kind: Optional[str] = None) -> StorageBackend:
+    """
+    Creates the storage backend for the given kind.
+
+    Args:
+        kind (Optional[str]): 'json' or 'sqlite'. Defaults to 'json'.
+
+    Raises:
+        ValueError: If the backend kind is unknown.
+
+    Returns:
+        StorageBackend: The created backend.
+    """
+    kind = (kind or 'json').lower()
+    if kind == 'json':
+        return JsonBackend()
+    if kind == 'sqlite':
+        return SqliteBackend()
+    raise ValueError(f"Unknown storage backend: {kind}")
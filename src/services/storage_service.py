@@ -1,71 +1,65 @@
-import json
-import os
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
 from loguru import logger
-from src.bot.config import DATA_FOLDER, FEEDBACK_FILE
+from src.services.storage_backend import StorageBackend, JsonBackend
 
 class StorageService:
     """
     Service for managing persistent storage of feedback messages.
     """
-    def __init__(self):
+    def __init__(self, backend: Optional[StorageBackend] = None):
         """
-        Initializes the storage service by ensuring the data folder exists and loading existing data.
+        Initializes the storage service with the given backend.
+
+        Args:
+            backend (Optional[StorageBackend]): Backend used for persistence. Defaults to the JSON backend.
         """
-        os.makedirs(DATA_FOLDER, exist_ok=True)
-        self.data = self._read_file()
-        
-    def _read_file(self) -> Dict[str, Any]:
+        self.backend = backend or JsonBackend()
+    
+    def add_message(self, message_text: str, date: str, time: str, user_id: Optional[int] = None) -> None:
         """
-        Reads the feedback file and returns its content as a dictionary.
+        Adds a new feedback message to the storage.
 
-        Returns:
-            Dict[str, Any]: The feedback data.
+        Args:
+            message_text (str): The text of the feedback message.
+            date (str): The date the message was received.
+            time (str): The time the message was received.
+            user_id (Optional[int]): The sender's Telegram ID. Defaults to None.
         """
-        if not os.path.exists(FEEDBACK_FILE):
-            self._write_to_file({"number_of_messages": 0})
-            
-        with open(FEEDBACK_FILE, 'r', encoding='utf-8') as f:
-            try:
-                data = json.loads(f.read())
-                logger.debug('Content loaded from json')
-            except json.JSONDecodeError:
-                logger.warning('Feedback file is empty, initializing...')
-                self._write_to_file({"number_of_messages": 0})
-                data = self._read_file()
+        self.add_messages([{'text': message_text, 'date': date, 'time': time, 'user_id': user_id}])
 
-        return data
-    
-    def _write_to_file(self, data: Dict[str, Any]) -> None:
+    def add_messages(self, messages: List[Dict[str, Any]]) -> None:
         """
-        Writes the provided data to the feedback file.
+        Adds a batch of feedback messages to the storage in a single write.
 
         Args:
-            data (Dict[str, Any]): The data to write.
+            messages (List[Dict[str, Any]]): Messages with 'text', 'date', 'time' and optional 'user_id'.
+
+        Raises:
+            Exception: If the batch could not be persisted.
         """
-        with open(FEEDBACK_FILE, 'w', encoding='utf-8') as f:
-            f.write(json.dumps(data, ensure_ascii=False, indent=2))
-            logger.debug('Content written to json')
-    
-    def add_message(self, message_text: str, date: str, time: str) -> Dict[str, Any]:
+        self.backend.add_messages(messages)
+        logger.debug(f'{len(messages)} message(s) written to storage')
+
+    def get_messages_by_date(self, date: str) -> List[Dict[str, Any]]:
         """
-        Adds a new feedback message to the storage and updates the JSON file.
+        Returns all feedback messages received on the given date.
 
         Args:
-            message_text (str): The text of the feedback message.
-            date (str): The date the message was received.
-            time (str): The time the message was received.
+            date (str): The date in YYYY-MM-DD format.
+
+        Returns:
+            List[Dict[str, Any]]: The matching messages.
+        """
+        return self.backend.get_messages_by_date(date)
+
+    def get_messages_by_user(self, user_id: int) -> List[Dict[str, Any]]:
+        """
+        Returns all feedback messages sent by the given user.
+
+        Args:
+            user_id (int): The user's Telegram ID.
 
         Returns:
-            Dict[str, Any]: The updated data dictionary.
+            List[Dict[str, Any]]: The matching messages.
         """
-        self.data['number_of_messages'] += 1
-        
-        self.data[str(self.data['number_of_messages'])] = {
-            'date': date,
-            'time': time,
-            'text': message_text
-        }
-        
-        self._write_to_file(self.data)
-        return self.data
+        return self.backend.get_messages_by_user(user_id)